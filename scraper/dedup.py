@@ -0,0 +1,95 @@
+"""Deduplication of headlines across a crawl with bounded memory.
+
+The same headline is often listed on several pages for one date. ``SeenTitles``
+remembers every (normalized title, scope) key it has been given in an on-disk
+SQLite table, so memory use stays flat however large the corpus grows, and a
+persistent database path lets later runs skip headlines already written.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import unicodedata
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_title(title: str) -> str:
+    """Fold case, Unicode forms, punctuation and whitespace so near-identical titles compare equal."""
+    title = unicodedata.normalize("NFKC", title).casefold()
+    title = _PUNCT_RE.sub(" ", title)
+    return _SPACE_RE.sub(" ", title).strip()
+
+
+def dedup_key(title: str, scope: str) -> bytes:
+    """Return a fixed-size 16-byte key for ``title`` within ``scope`` (usually an ISO date)."""
+    raw = f"{scope}\x00{normalize_title(title)}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+class SeenTitles:
+    """Disk-backed set of dedup keys.
+
+    With ``path=None`` a temporary database is used and removed on ``close``.
+    A persistent ``path`` uses WAL with ``synchronous=NORMAL`` so a crash
+    cannot corrupt it; call ``commit`` once the records for the keys added so
+    far are written. SQLite's page cache is capped at ``cache_kib`` KiB, which
+    bounds memory.
+    """
+
+    def __init__(self, path: str = None, cache_kib: int = 8192, commit_every: int = 1000):
+        self._temp = path is None
+        if self._temp:
+            fd, path = tempfile.mkstemp(prefix="ndli-toi-seen-", suffix=".sqlite")
+            os.close(fd)
+        self.path = path
+        self.commit_every = commit_every
+        self._pending = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(f"PRAGMA cache_size=-{int(cache_kib)}")
+        if self._temp:
+            # throwaway database: durability does not matter
+            self._conn.execute("PRAGMA synchronous=OFF")
+        else:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, key: bytes) -> bool:
+        """Record ``key``; return True if it was new, False if already seen."""
+        cur = self._conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+        if cur.rowcount:
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self.commit()
+            return True
+        return False
+
+    def commit(self) -> None:
+        """Make the keys added so far durable."""
+        if self._pending:
+            self._conn.commit()
+            self._pending = 0
+
+    def __contains__(self, key: bytes) -> bool:
+        return self._conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        self._conn.commit()
+        self._conn.close()
+        self._conn = None
+        if self._temp:
+            os.remove(self.path)
+
+    def __enter__(self) -> "SeenTitles":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,54 @@
+"""Structured crawl events delivered to registered callbacks.
+
+``scraper.scrape_toi`` emits an event at each interesting point of the crawl:
+
+- ``fetch_start`` / ``fetch_end``: around every HTTP GET (url, page_type,
+  seconds, bytes, error)
+- ``parse``: after an HTML page is parsed (url, page_type, seconds)
+- ``resolve``: when ``extract_external_link`` finishes (article_url, branch
+  that produced the result, url, requests it cost, seconds)
+- ``record``: for every record written by the hierarchical crawl
+
+Each callback receives one dict with at least ``event`` and ``ts`` keys. When
+no callback is registered ``emit`` returns immediately.
+"""
+import sys
+import time
+
+FETCH_START = "fetch_start"
+FETCH_END = "fetch_end"
+PARSE = "parse"
+RESOLVE = "resolve"
+RECORD = "record"
+
+_hooks = []
+
+
+def register(callback):
+    """Register ``callback(event_dict)``; returns it so it can be used as a decorator."""
+    if callback not in _hooks:
+        _hooks.append(callback)
+    return callback
+
+
+def unregister(callback) -> None:
+    """Remove a previously registered callback (no-op if it is not registered)."""
+    try:
+        _hooks.remove(callback)
+    except ValueError:
+        pass
+
+
+def emit(event: str, **fields) -> None:
+    """Deliver ``event`` with ``fields`` to every registered callback.
+
+    A failing callback is reported on stderr and never interrupts the crawl.
+    """
+    if not _hooks:
+        return
+    payload = {"event": event, "ts": time.time(), **fields}
+    for callback in list(_hooks):
+        try:
+            callback(payload)
+        except Exception as e:
+            print(f"event hook {callback!r} failed on {event}: {e}", file=sys.stderr)
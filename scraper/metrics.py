@@ -0,0 +1,235 @@
+"""Crawl instrumentation: per-page-type counters and latency histograms.
+
+Every fetch and parse stage in ``scraper.scrape_toi`` reports into the
+module-level ``metrics`` registry. The registry can be exposed while a crawl
+is running through a Prometheus-format HTTP endpoint (``start_http_server``)
+and/or a JSON stats file rewritten periodically (``StatsFileWriter``).
+"""
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = "ndli_toi"
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "buckets": {str(b): c for b, c in zip(self.buckets, self.counts)},
+        }
+
+
+class CrawlMetrics:
+    """Thread-safe registry of counters and histograms keyed by page type.
+
+    Counters: ``fetches``, ``fetch_errors``, ``bytes``, ``records`` and
+    ``duplicates`` (records skipped by ``--dedup``).
+    Histograms: ``fetch_seconds`` and ``parse_seconds``.
+
+    Records are counted under the page type they were extracted from; the
+    crawl only emits titles from date pages, so its records land under "date".
+    """
+
+    COUNTERS = ("fetches", "fetch_errors", "bytes", "records", "duplicates")
+    HISTOGRAMS = ("fetch_seconds", "parse_seconds")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.counters = {name: {} for name in self.COUNTERS}
+            self.histograms = {name: {} for name in self.HISTOGRAMS}
+
+    def inc(self, name: str, page_type: str, value: float = 1) -> None:
+        with self._lock:
+            per_type = self.counters[name]
+            per_type[page_type] = per_type.get(page_type, 0) + value
+
+    def observe(self, name: str, page_type: str, seconds: float) -> None:
+        with self._lock:
+            per_type = self.histograms[name]
+            hist = per_type.get(page_type)
+            if hist is None:
+                hist = per_type[page_type] = Histogram()
+            hist.observe(seconds)
+
+    def observe_fetch(self, page_type: str, seconds: float, nbytes: int = 0, error: bool = False) -> None:
+        self.inc("fetches", page_type)
+        self.observe("fetch_seconds", page_type, seconds)
+        if error:
+            self.inc("fetch_errors", page_type)
+        elif nbytes:
+            self.inc("bytes", page_type, nbytes)
+
+    def observe_parse(self, page_type: str, seconds: float) -> None:
+        self.observe("parse_seconds", page_type, seconds)
+
+    def record_emitted(self, page_type: str = "date", count: int = 1) -> None:
+        self.inc("records", page_type, count)
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serialisable view of all metrics."""
+        with self._lock:
+            elapsed = time.time() - self.started
+            records = self.counters["records"]
+            rate = (lambda n: round(n / elapsed, 3)) if elapsed > 0 else (lambda n: 0.0)
+            return {
+                "started": self.started,
+                "elapsed_seconds": round(elapsed, 3),
+                "records_per_second": rate(sum(records.values())),
+                "records_per_second_by_page_type": {pt: rate(n) for pt, n in records.items()},
+                "counters": {name: dict(per_type) for name, per_type in self.counters.items()},
+                "histograms": {
+                    name: {pt: h.to_dict() for pt, h in per_type.items()}
+                    for name, per_type in self.histograms.items()
+                },
+            }
+
+    def render_prometheus(self) -> str:
+        """Render the registry in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in self.COUNTERS:
+                metric = f"{METRIC_PREFIX}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for page_type, value in sorted(self.counters[name].items()):
+                    lines.append(f'{metric}{{page_type="{page_type}"}} {value}')
+            for name in self.HISTOGRAMS:
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for page_type, hist in sorted(self.histograms[name].items()):
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        lines.append(f'{metric}_bucket{{page_type="{page_type}",le="{bound}"}} {count}')
+                    lines.append(f'{metric}_bucket{{page_type="{page_type}",le="+Inf"}} {hist.count}')
+                    lines.append(f'{metric}_sum{{page_type="{page_type}"}} {hist.sum}')
+                    lines.append(f'{metric}_count{{page_type="{page_type}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        """Atomically (re)write the current snapshot to ``path``."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+    def summary(self) -> str:
+        """Return a human-readable end-of-crawl report."""
+        snap = self.snapshot()
+        counters = snap["counters"]
+        fetch_hist = snap["histograms"]["fetch_seconds"]
+        parse_hist = snap["histograms"]["parse_seconds"]
+        page_types = sorted(set(counters["fetches"]) | set(parse_hist) | set(counters["records"]))
+
+        lines = [
+            f"Crawl summary: {snap['elapsed_seconds']:.1f}s elapsed, "
+            f"{sum(counters['records'].values())} records "
+            f"({snap['records_per_second']:.2f}/s), "
+            f"{sum(counters['duplicates'].values())} duplicates skipped",
+            f"{'page_type':<12} {'fetches':>8} {'errors':>7} {'MB':>8} "
+            f"{'fetch_s':>9} {'avg_ms':>8} {'parse_s':>9} {'records':>8} {'rec/s':>8}",
+        ]
+        for pt in page_types:
+            fh = fetch_hist.get(pt, {})
+            ph = parse_hist.get(pt, {})
+            lines.append(
+                f"{pt:<12} {counters['fetches'].get(pt, 0):>8} "
+                f"{counters['fetch_errors'].get(pt, 0):>7} "
+                f"{counters['bytes'].get(pt, 0) / 1e6:>8.2f} "
+                f"{fh.get('sum', 0.0):>9.2f} {fh.get('avg', 0.0) * 1000:>8.1f} "
+                f"{ph.get('sum', 0.0):>9.2f} {counters['records'].get(pt, 0):>8} "
+                f"{snap['records_per_second_by_page_type'].get(pt, 0.0):>8.2f}"
+            )
+        return "\n".join(lines)
+
+
+metrics = CrawlMetrics()
+
+
+def start_http_server(port: int, host: str = "", registry: CrawlMetrics = metrics) -> "ThreadingHTTPServer":
+    """Serve ``/metrics`` (Prometheus text) and ``/stats`` (JSON) in a daemon thread.
+
+    Returns the server; call ``shutdown()`` on it to stop serving.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                body = registry.render_prometheus().encode("utf-8")
+                ctype = "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/stats":
+                body = json.dumps(registry.snapshot()).encode("utf-8")
+                ctype = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # keep scrape output (and the progress bar) clean
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    return server
+
+
+class StatsFileWriter:
+    """Periodically rewrite a JSON stats file from a background thread."""
+
+    def __init__(self, path: str, interval: float = 10.0, registry: CrawlMetrics = metrics):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-stats-file", daemon=True)
+
+    def start(self) -> "StatsFileWriter":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.registry.write_json(self.path)
+
+    def stop(self) -> None:
+        """Stop the writer thread and write one final snapshot."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.registry.write_json(self.path)
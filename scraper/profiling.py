@@ -0,0 +1,108 @@
+"""Profiling mode: per-URL event traces and an aggregated hot-spot report.
+
+``Profiler`` is an ``scraper.events`` callback. It appends every event it
+receives to a JSON-lines trace file and aggregates time per URL, per page
+type and per ``extract_external_link`` branch, so ``report()`` can show where
+the crawl time goes and which resolver heuristics are the most expensive.
+"""
+import json
+import threading
+
+from scraper import events
+
+
+class Profiler:
+    """Collect crawl events into a trace file and hot-spot aggregates."""
+
+    def __init__(self, trace_path: str):
+        self.trace_path = trace_path
+        self._lock = threading.Lock()
+        self._trace = open(trace_path, "w", encoding="utf-8")
+        # url -> {"page_type", "fetches", "fetch_seconds", "parse_seconds", "bytes", "errors"}
+        self.urls = {}
+        # branch -> {"count", "requests", "seconds"}
+        self.branches = {}
+        self.records = 0
+
+    def __call__(self, event: dict) -> None:
+        kind = event["event"]
+        with self._lock:
+            self._trace.write(json.dumps(event, ensure_ascii=False) + "\n")
+            if kind == events.FETCH_END:
+                stats = self._url_stats(event["url"], event["page_type"])
+                stats["fetches"] += 1
+                stats["fetch_seconds"] += event["seconds"]
+                stats["bytes"] += event.get("bytes", 0)
+                if event.get("error"):
+                    stats["errors"] += 1
+            elif kind == events.PARSE and event.get("url"):
+                stats = self._url_stats(event["url"], event["page_type"])
+                stats["parse_seconds"] += event["seconds"]
+            elif kind == events.RESOLVE:
+                stats = self.branches.setdefault(event["branch"], {"count": 0, "requests": 0, "seconds": 0.0})
+                stats["count"] += 1
+                stats["requests"] += event["requests"]
+                stats["seconds"] += event["seconds"]
+            elif kind == events.RECORD:
+                self.records += 1
+
+    def _url_stats(self, url: str, page_type: str) -> dict:
+        stats = self.urls.get(url)
+        if stats is None:
+            stats = self.urls[url] = {
+                "page_type": page_type,
+                "fetches": 0,
+                "fetch_seconds": 0.0,
+                "parse_seconds": 0.0,
+                "bytes": 0,
+                "errors": 0,
+            }
+        return stats
+
+    def __enter__(self) -> "Profiler":
+        events.register(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        events.unregister(self)
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._trace.closed:
+                self._trace.close()
+
+    def report(self, top: int = 15) -> str:
+        """Return a text report of page types, resolver branches and slowest URLs."""
+        with self._lock:
+            urls = {u: dict(s) for u, s in self.urls.items()}
+            branches = {b: dict(s) for b, s in self.branches.items()}
+            records = self.records
+
+        by_type = {}
+        for stats in urls.values():
+            agg = by_type.setdefault(stats["page_type"], {"urls": 0, "fetch_seconds": 0.0, "parse_seconds": 0.0})
+            agg["urls"] += 1
+            agg["fetch_seconds"] += stats["fetch_seconds"]
+            agg["parse_seconds"] += stats["parse_seconds"]
+
+        lines = [f"Profile: {len(urls)} urls, {records} records, trace in {self.trace_path}", ""]
+        lines.append(f"{'page_type':<12} {'urls':>6} {'fetch_s':>9} {'parse_s':>9}")
+        for pt, agg in sorted(by_type.items(), key=lambda kv: -(kv[1]["fetch_seconds"] + kv[1]["parse_seconds"])):
+            lines.append(f"{pt:<12} {agg['urls']:>6} {agg['fetch_seconds']:>9.2f} {agg['parse_seconds']:>9.2f}")
+
+        if branches:
+            lines.append("")
+            lines.append(f"{'resolver branch':<22} {'count':>6} {'requests':>9} {'req/call':>9} {'total_s':>9} {'avg_ms':>8}")
+            for branch, s in sorted(branches.items(), key=lambda kv: -kv[1]["seconds"]):
+                lines.append(
+                    f"{branch:<22} {s['count']:>6} {s['requests']:>9} {s['requests'] / s['count']:>9.2f} "
+                    f"{s['seconds']:>9.2f} {s['seconds'] / s['count'] * 1000:>8.1f}"
+                )
+
+        lines.append("")
+        lines.append(f"Slowest {top} urls (fetch + parse):")
+        slowest = sorted(urls.items(), key=lambda kv: -(kv[1]["fetch_seconds"] + kv[1]["parse_seconds"]))[:top]
+        for url, s in slowest:
+            lines.append(f"{s['fetch_seconds'] + s['parse_seconds']:>8.3f}s  {s['page_type']:<12} {url}")
+        return "\n".join(lines)
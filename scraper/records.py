@@ -0,0 +1,47 @@
+"""Compact record type for scraped titles.
+
+A crawl emits one record per headline. ``TitleRecord`` stores its fields in
+``__slots__`` (no per-instance ``__dict__``), which keeps records small where
+they are held in bulk. The hierarchy URLs are stored as given: the crawl passes
+the same string objects for every record of a page, so they are shared without
+interning (which would keep every URL alive for the whole process).
+"""
+import json
+
+
+class TitleRecord:
+    """One scraped headline and the hierarchy pages it was found under.
+
+    ``article_url`` and ``external_url`` are only set when externals are
+    resolved; ``to_dict`` leaves them out otherwise, matching the plain
+    ``{"year_url","month_url","date_url","title"}`` output.
+    """
+
+    __slots__ = ("year_url", "month_url", "date_url", "title", "article_url", "external_url")
+
+    def __init__(self, year_url: str, month_url: str, date_url: str, title: str,
+                 article_url: str = None, external_url: str = None):
+        self.year_url = year_url
+        self.month_url = month_url
+        self.date_url = date_url
+        self.title = title
+        self.article_url = article_url
+        self.external_url = external_url
+
+    def to_dict(self) -> dict:
+        d = {
+            "year_url": self.year_url,
+            "month_url": self.month_url,
+            "date_url": self.date_url,
+            "title": self.title,
+        }
+        if self.article_url is not None:
+            d["article_url"] = self.article_url
+            d["external_url"] = self.external_url
+        return d
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def __repr__(self) -> str:
+        return f"TitleRecord(date_url={self.date_url!r}, title={self.title!r})"
@@ -5,35 +5,120 @@ Usage:
         --output output.jsonl --max-pages 200
 
 This script performs a breadth-first crawl limited to the ndl.gov.in domain and writes one JSON object per line.
+
+``requests``, ``bs4``/``lxml`` and ``tqdm`` are imported lazily on first use so
+that ``--help`` and the listing modes do not pay for them up front; the listing
+modes also accept many start URLs on stdin with ``--batch``.
 """
 import argparse
-import json
+import re
+import sys
 import time
+from typing import TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
-from tqdm import tqdm
-
+from scraper import events
+from scraper.metrics import StatsFileWriter, metrics, start_http_server
+from scraper.profiling import Profiler
+from scraper.records import TitleRecord
 from scraper.utils import extract_titles_from_page
 
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
+
 
 HEADERS = {"User-Agent": "ndli-toi-titles-scraper/1.0 (+https://github.com/)"}
 
+# 4-digit year anywhere in a URL
+YEAR_RE = re.compile(r"(19|20)\d{2}")
+# date page anchor texts: '12', '01 Jan', '2017-01-01', '1-Jan-2017'
+DAY_NUMBER_RE = re.compile(r"\d{1,2}")
+DAY_MONTH_RE = re.compile(r"\d{1,2}\s*[A-Za-z]{3,9}")
+ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+DAY_MONTH_YEAR_RE = re.compile(r"\d{1,2}-[A-Za-z]{3,9}-\d{4}")
+# date-like tokens inside a URL
+URL_DATE_RE = re.compile(r"(19|20)\d{2}[-_/]?\d{1,2}[-_/]?\d{1,2}")
+# an explicit, separated YYYY-MM-DD (or _ or /) path segment, never a digit run inside an id
+DATE_SEGMENT_RE = re.compile(r"(?<![0-9])((?:19|20)\d{2})[-_/](\d{1,2})[-_/](\d{1,2})(?![0-9])")
+TRAILING_DAY_RE = re.compile(r"/(\d{1,2})$")
+# headline/article pages: /nw_document/toi/timesofindia/<numeric_id>
+HEADLINE_PATH_RE = re.compile(r"/nw_document/toi/timesofindia/\d+$")
+NDLI_ID_RE = re.compile(r"/(\d+)$")
+NEWS_RE = re.compile(r"timesofindia|indiatimes|articleshow|\.cms", re.IGNORECASE)
+# window.open('URL' ...) and location.href = 'URL' / location.replace('URL')
+JS_WINDOW_OPEN_RE = re.compile(r"window\.open\(['\"]([^'\"]+)['\"]")
+JS_LOCATION_RE = re.compile(r"location(?:\.href|\.replace)?\s*=\s*['\"]([^'\"]+)['\"]")
+
+_session = None
+
 
 def normalize_link(base: str, link: str) -> str:
     return urljoin(base, link)
 
 
+def _get_session():
+    """Return the shared ``requests.Session``, importing ``requests`` on first use."""
+    global _session
+    if _session is None:
+        import requests
+
+        _session = requests.Session()
+        _session.headers.update(HEADERS)
+    return _session
+
+
+def _warn(msg: str) -> None:
+    """Print ``msg`` without breaking an active progress bar."""
+    from tqdm import tqdm
+
+    tqdm.write(msg)
+
+
+def fetch(url: str, page_type: str, **kwargs) -> "requests.Response":
+    """GET ``url`` and raise on HTTP errors, recording latency/bytes under ``page_type``."""
+    kwargs.setdefault("timeout", 15)
+    events.emit(events.FETCH_START, url=url, page_type=page_type)
+    start = time.perf_counter()
+    try:
+        resp = _get_session().get(url, **kwargs)
+        resp.raise_for_status()
+    except Exception as e:
+        elapsed = time.perf_counter() - start
+        metrics.observe_fetch(page_type, elapsed, error=True)
+        events.emit(events.FETCH_END, url=url, page_type=page_type, seconds=elapsed, bytes=0, error=str(e))
+        raise
+    if kwargs.get("stream"):
+        # don't pull a streamed body just to count it
+        nbytes = int(resp.headers.get("Content-Length") or 0)
+    else:
+        nbytes = len(resp.content)
+    elapsed = time.perf_counter() - start
+    metrics.observe_fetch(page_type, elapsed, nbytes=nbytes)
+    events.emit(events.FETCH_END, url=url, page_type=page_type, seconds=elapsed, bytes=nbytes, error=None)
+    return resp
+
+
+def parse_html(html: str, page_type: str, url: str = None) -> "BeautifulSoup":
+    """Parse ``html`` with lxml, recording parse time under ``page_type``."""
+    from bs4 import BeautifulSoup
+
+    start = time.perf_counter()
+    soup = BeautifulSoup(html, "lxml")
+    elapsed = time.perf_counter() - start
+    metrics.observe_parse(page_type, elapsed)
+    events.emit(events.PARSE, url=url, page_type=page_type, seconds=elapsed)
+    return soup
+
+
 def list_year_urls(start_url: str) -> list:
     """Return a list of candidate year URLs from the start page."""
     try:
-        resp = requests.get(start_url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
+        resp = fetch(start_url, "start")
     except Exception as e:
         raise RuntimeError(f"Failed to fetch start url {start_url}: {e}")
 
-    soup = BeautifulSoup(resp.text, "lxml")
+    soup = parse_html(resp.text, "start", start_url)
     parsed = urlparse(start_url)
     base = f"{parsed.scheme}://{parsed.netloc}"
 
@@ -53,18 +138,20 @@ def list_year_urls(start_url: str) -> list:
     return years
 
 
-def list_linked_pages(url: str) -> list:
-    """Return all same-domain links found on the given page."""
+def list_linked_pages(url: str, page_type: str = "page") -> list:
+    """Return all same-domain links found on the given page.
+
+    ``page_type`` labels the fetch/parse metrics (e.g. "year" or "month").
+    """
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
+        resp = fetch(url, page_type)
     except Exception as e:
-        tqdm.write(f"Failed to fetch {url}: {e}")
+        _warn(f"Failed to fetch {url}: {e}")
         return []
 
     parsed = urlparse(url)
     base = f"{parsed.scheme}://{parsed.netloc}"
-    soup = BeautifulSoup(resp.text, "lxml")
+    soup = parse_html(resp.text, page_type, url)
     links = []
     seen = set()
     for a in soup.find_all("a", href=True):
@@ -89,19 +176,17 @@ def list_month_urls(year_url: str) -> list:
     in their path and are different from the provided year_url.
     """
     try:
-        resp = requests.get(year_url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
+        resp = fetch(year_url, "year")
     except Exception as e:
         raise RuntimeError(f"Failed to fetch year url {year_url}: {e}")
 
     parsed = urlparse(year_url)
     base = f"{parsed.scheme}://{parsed.netloc}"
-    soup = BeautifulSoup(resp.text, "lxml")
+    soup = parse_html(resp.text, "year", year_url)
 
     year = None
     # Try to extract 4-digit year from the URL
-    import re
-    m = re.search(r"(19|20)\d{2}", year_url)
+    m = YEAR_RE.search(year_url)
     if m:
         year = m.group(0)
 
@@ -140,20 +225,17 @@ def list_date_urls(month_url: str) -> list:
     The function returns an ordered list of (label, full_url).
     """
     try:
-        resp = requests.get(month_url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
+        resp = fetch(month_url, "month")
     except Exception as e:
         raise RuntimeError(f"Failed to fetch month url {month_url}: {e}")
 
     parsed = urlparse(month_url)
     base = f"{parsed.scheme}://{parsed.netloc}"
-    soup = BeautifulSoup(resp.text, "lxml")
+    soup = parse_html(resp.text, "month", month_url)
 
     candidates = []
     seen = set()
 
-    import re
-
     # Prefer the month-specific container in the stitching pane when available.
     # The page uses an id like `col_toi_timesofindia_<month_last_segment>` where
     # <month_last_segment> is the last path segment of the month_url. Restricting
@@ -176,21 +258,21 @@ def list_date_urls(month_url: str) -> list:
 
         label = None
         # simple day number
-        if re.fullmatch(r"\d{1,2}", text):
+        if DAY_NUMBER_RE.fullmatch(text):
             label = text
         else:
             # look for patterns like '01 Jan', '1-Jan-2017', '2017-01-01', '1 Jan 2017'
-            if re.search(r"\d{1,2}\s*[A-Za-z]{3,9}", text) or re.search(r"\d{4}-\d{2}-\d{2}", text) or re.search(r"\d{1,2}-[A-Za-z]{3,9}-\d{4}", text):
+            if DAY_MONTH_RE.search(text) or ISO_DATE_RE.search(text) or DAY_MONTH_YEAR_RE.search(text):
                 label = text
 
         # if label still None, try to extract a date-like segment from URL
         if label is None:
-            m = re.search(r"(19|20)\d{2}[-_/]?\d{1,2}[-_/]?\d{1,2}", full)
+            m = URL_DATE_RE.search(full)
             if m:
                 label = m.group(0)
             else:
                 # try trailing numeric segment
-                m2 = re.search(r"/(\d{1,2})$", full)
+                m2 = TRAILING_DAY_RE.search(full)
                 if m2:
                     label = m2.group(1)
 
@@ -209,13 +291,16 @@ def list_date_urls(month_url: str) -> list:
 def extract_titles_from_date_url(date_url: str) -> list:
     """Fetch a date page and extract candidate titles."""
     try:
-        resp = requests.get(date_url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
+        resp = fetch(date_url, "date")
     except Exception as e:
-        tqdm.write(f"Failed to fetch {date_url}: {e}")
+        _warn(f"Failed to fetch {date_url}: {e}")
         return []
 
+    start = time.perf_counter()
     out = extract_titles_from_page(resp.text)
+    elapsed = time.perf_counter() - start
+    metrics.observe_parse("date", elapsed)
+    events.emit(events.PARSE, url=date_url, page_type="date", seconds=elapsed)
     return out.get("titles", [])
 
 
@@ -227,17 +312,13 @@ def list_headline_urls(date_url: str) -> list:
     ends with a number and whose text looks like a headline.
     """
     try:
-        resp = requests.get(date_url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
+        resp = fetch(date_url, "date")
     except Exception as e:
         raise RuntimeError(f"Failed to fetch date url {date_url}: {e}")
 
     parsed = urlparse(date_url)
     base = f"{parsed.scheme}://{parsed.netloc}"
-    soup = BeautifulSoup(resp.text, "lxml")
-
-    import re
-    pattern = re.compile(r"/nw_document/toi/timesofindia/\d+$")
+    soup = parse_html(resp.text, "date", date_url)
 
     results = []
     seen = set()
@@ -252,7 +333,7 @@ def list_headline_urls(date_url: str) -> list:
             continue
         full = normalize_link(base, href)
         # Only keep anchors whose path ends with a numeric id under the collection
-        if not pattern.search(urlparse(full).path):
+        if not HEADLINE_PATH_RE.search(urlparse(full).path):
             continue
         text = a.get_text(separator=" ", strip=True)
         if not text or len(text) < 4:
@@ -275,23 +356,38 @@ def extract_external_link(article_url: str) -> str | None:
     - iframe[src] pointing to an external host
     - anchor hrefs that point to non-ndl domains (prefer ones containing known news domains)
     Returns the first candidate external URL or None if not found.
+
+    Emits a ``resolve`` event naming the heuristic branch that produced the
+    result and how many HTTP requests it took.
     """
+    requests_made = 0
+
+    def get(url: str, page_type: str, **kwargs) -> "requests.Response":
+        nonlocal requests_made
+        requests_made += 1
+        return fetch(url, page_type, **kwargs)
+
+    start = time.perf_counter()
+    url, branch = _resolve_external_link(article_url, get)
+    events.emit(events.RESOLVE, article_url=article_url, branch=branch, url=url,
+                requests=requests_made, seconds=time.perf_counter() - start)
+    return url
+
+
+def _resolve_external_link(article_url: str, get) -> tuple:
+    """Run the ``extract_external_link`` heuristics; returns (url or None, branch)."""
     try:
-        resp = requests.get(article_url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
+        resp = get(article_url, "article")
     except Exception:
-        return None
+        return None, "article_fetch_failed"
 
-    soup = BeautifulSoup(resp.text, "lxml")
-    from urllib.parse import urlparse
+    soup = parse_html(resp.text, "article", article_url)
 
     base = f"{urlparse(article_url).scheme}://{urlparse(article_url).netloc}"
 
-    import re
-    news_re = re.compile(r"timesofindia|indiatimes|articleshow|\.cms", re.IGNORECASE)
     # extract NDLI numeric id from article_url (e.g., /.../56881247)
     ndli_id = None
-    m_id = re.search(r"/(\d+)$", urlparse(article_url).path)
+    m_id = NDLI_ID_RE.search(urlparse(article_url).path)
     if m_id:
         ndli_id = m_id.group(1)
 
@@ -308,10 +404,10 @@ def extract_external_link(article_url: str) -> str | None:
         if not js:
             return urls
         # window.open('URL' ...), window.open("URL" ...)
-        for m in re.finditer(r"window\.open\(['\"]([^'\"]+)['\"]", js):
+        for m in JS_WINDOW_OPEN_RE.finditer(js):
             urls.append(m.group(1))
         # location.href = 'URL' or location.replace('URL')
-        for m in re.finditer(r"location(?:\.href|\.replace)?\s*=\s*['\"]([^'\"]+)['\"]", js):
+        for m in JS_LOCATION_RE.finditer(js):
             urls.append(m.group(1))
         return urls
 
@@ -326,13 +422,12 @@ def extract_external_link(article_url: str) -> str | None:
         if "viewer.php" in src or "module-viewer" in src:
             viewer_url = normalize_link(base, src)
             try:
-                vresp = requests.get(viewer_url, headers=HEADERS, timeout=15)
-                vresp.raise_for_status()
+                vresp = get(viewer_url, "viewer")
             except Exception:
                 # if viewer fetch fails, continue to other heuristics
                 vresp = None
             if vresp:
-                v_soup = BeautifulSoup(vresp.text, "lxml")
+                v_soup = parse_html(vresp.text, "viewer", viewer_url)
                 # 1) anchors with href
                 for a in v_soup.find_all("a", href=True):
                     href = a["href"].strip()
@@ -344,9 +439,9 @@ def extract_external_link(article_url: str) -> str | None:
                         continue
                     # prefer NDLI id in mapped URL, else news domain
                     if ndli_id and ndli_id in full:
-                        return full
-                    if news_re.search(full):
-                        return full
+                        return full, "viewer_anchor"
+                    if NEWS_RE.search(full):
+                        return full, "viewer_anchor"
                 # 2) anchors with data-href or data-url attributes
                 for a in v_soup.find_all(True):
                     for attr in ("data-href", "data-url", "data-link"):
@@ -355,9 +450,9 @@ def extract_external_link(article_url: str) -> str | None:
                             full = normalize_link(viewer_url, val.strip())
                             if is_external(full):
                                 if ndli_id and ndli_id in full:
-                                    return full
-                                if news_re.search(full):
-                                    return full
+                                    return full, "viewer_data_attr"
+                                if NEWS_RE.search(full):
+                                    return full, "viewer_data_attr"
                 # 3) buttons or elements with onclick javascript that opens a URL
                 for el in v_soup.find_all(True, onclick=True):
                     js = el.get("onclick")
@@ -365,17 +460,17 @@ def extract_external_link(article_url: str) -> str | None:
                         full = normalize_link(viewer_url, u)
                         if is_external(full):
                             if ndli_id and ndli_id in full:
-                                return full
-                            if news_re.search(full):
-                                return full
+                                return full, "viewer_onclick"
+                            if NEWS_RE.search(full):
+                                return full, "viewer_onclick"
                 # 4) meta tags inside viewer page
                 for prop in ("og:url", "twitter:url"):
                     tag = v_soup.find("meta", property=prop) or v_soup.find("meta", attrs={"name": prop})
                     if tag and tag.get("content") and is_external(tag.get("content")):
-                        return tag.get("content")
+                        return tag.get("content"), "viewer_meta"
                 linkc = v_soup.find("link", rel="canonical")
                 if linkc and linkc.get("href") and is_external(linkc.get("href")):
-                    return linkc.get("href")
+                    return linkc.get("href"), "viewer_canonical"
                 # 5) nested iframe inside viewer
                 nested = v_soup.find("iframe", src=True)
                 if nested:
@@ -383,7 +478,7 @@ def extract_external_link(article_url: str) -> str | None:
                     if nsrc:
                         nfull = normalize_link(viewer_url, nsrc)
                         if is_external(nfull):
-                            return nfull
+                            return nfull, "viewer_nested_iframe"
                 # otherwise continue to other heuristics
 
     for a in soup.find_all("a", href=True):
@@ -399,26 +494,26 @@ def extract_external_link(article_url: str) -> str | None:
                 continue
             # prefer links that include the NDLI id (mapping) or match news patterns
             if ndli_id and ndli_id in full:
-                return full
-            if news_re.search(full):
-                return full
+                return full, "button"
+            if NEWS_RE.search(full):
+                return full, "button"
 
     # 1) meta og:url / twitter:url
     for prop in ("og:url", "twitter:url"):
         tag = soup.find("meta", property=prop) or soup.find("meta", attrs={"name": prop})
         if tag and tag.get("content") and is_external(tag.get("content")):
-            return tag.get("content")
+            return tag.get("content"), "meta"
 
     # 2) canonical
     linkc = soup.find("link", rel="canonical")
     if linkc and linkc.get("href") and is_external(linkc.get("href")):
-        return linkc.get("href")
+        return linkc.get("href"), "canonical"
 
     # 3) iframe[src]
     for iframe in soup.find_all("iframe", src=True):
         src = iframe.get("src").strip()
         if is_external(src):
-            return src
+            return src, "iframe"
 
     # 4) anchor hrefs -> collect external anchors but only accept news-like
     # domains or links that include the NDLI id. Do NOT return arbitrary
@@ -438,33 +533,63 @@ def extract_external_link(article_url: str) -> str | None:
     if ndli_id:
         for c in candidates:
             if ndli_id in c:
-                return c
+                return c, "anchor_ndli_id"
 
     # Then prefer news-like domains
     for c in candidates:
-        if news_re.search(c):
-            return c
+        if NEWS_RE.search(c):
+            return c, "anchor_news"
     # FINAL FALLBACK: try constructing a Times of India articleshow URL using the NDLI id.
     # Many TOI article pages live at /articleshow/<id>.cms and will redirect to the full slug URL.
     if ndli_id:
         try:
             candidate = f"https://timesofindia.indiatimes.com/articleshow/{ndli_id}.cms"
             # use GET with allow_redirects to discover final URL without downloading large body
-            r = requests.get(candidate, headers=HEADERS, timeout=15, allow_redirects=True, stream=True)
+            r = get(candidate, "articleshow", allow_redirects=True, stream=True)
             # close the stream without reading body
             try:
                 r.close()
             except Exception:
                 pass
             if r.status_code and r.status_code < 400 and is_external(r.url):
-                return r.url
+                return r.url, "articleshow"
         except Exception:
             pass
 
     # otherwise do not return arbitrary external links
+    return None, "unresolved"
+
+
+def date_key(date_url: str) -> str | None:
+    """Return the ISO date ('2017-01-01') spelled out in the path of ``date_url``, or None.
+
+    Only separated year/month/day segments count, so numeric NDLI ids
+    (``.../56201234``) and ``IN__thetoi_2024__6560_6561`` style ids give None.
+    """
+    for m in DATE_SEGMENT_RE.finditer(urlparse(date_url).path):
+        year, month, day = (int(g) for g in m.groups())
+        if 1 <= month <= 12 and 1 <= day <= 31:
+            return f"{year:04d}-{month:02d}-{day:02d}"
     return None
 
 
+def dedup_scope(month_url: str, date_url: str) -> str:
+    """Return the scope a title's dedup key is compared within.
+
+    That is the ISO date from ``date_key`` when the date page URL spells one
+    out; NDLI date pages use opaque ids, so otherwise it is the month page the
+    date page was listed on.
+    """
+    day = date_key(date_url)
+    return day if day is not None else f"month:{month_url}"
+
+
+def article_dedup_key(article_url: str) -> str:
+    """Return the NDLI numeric id of ``article_url``, or the URL itself if it has none."""
+    id_match = NDLI_ID_RE.search(urlparse(article_url).path)
+    return id_match.group(1) if id_match else article_url
+
+
 def run_hierarchical_scrape(start_url: str,
                             output_path: str = "output_titles.jsonl",
                             delay: float = 1.0,
@@ -472,77 +597,110 @@ def run_hierarchical_scrape(start_url: str,
                             max_months: int = None,
                             max_dates: int = None,
                             max_titles_per_date: int = None,
-                            resolve_externals: bool = False):
+                            resolve_externals: bool = False,
+                            dedup: bool = False,
+                            dedup_db: str = None):
     """Run hierarchical scraping: list years, then months, then dates, then extract titles.
 
     Writes JSON lines with {"year_url","month_url","date_url","title"}.
     Parameters allow limiting the breadth/depth for small-scale experiments.
+    With ``dedup`` a headline already written is skipped, and is not resolved
+    again. With ``resolve_externals`` headlines are identified by their NDLI
+    article id; otherwise by normalized title within ``dedup_scope`` (the date
+    spelled out in the date page URL, else the month page). ``dedup_db``
+    (implies ``dedup``) keeps the seen set on disk across runs, and output is
+    then appended to ``output_path`` so earlier runs' records are kept.
+
+    The module ``metrics`` registry is reset first, so its counters and
+    rates cover this crawl only.
     """
+    metrics.reset()
     years = list_year_urls(start_url)
     if max_years:
         years = years[:max_years]
 
-    with open(output_path, "w", encoding="utf-8") as out_f:
-        pbar = tqdm(total=len(years), desc="years")
-        for y in years:
-            # From a year page, list month-like links
-            month_links = list_linked_pages(y)
-            # Heuristic: months often include the year in path or be under the year page
-            if max_months:
-                month_links = month_links[:max_months]
-
-            for m in month_links:
-                # From month page, there will be date links
-                date_links = list_linked_pages(m)
-                if max_dates:
-                    date_links = date_links[:max_dates]
-
-                for d in date_links:
-                    # If resolving externals, prefer to fetch headline entries (title,url)
-                    # so we have the article URL to pass into the resolver. Otherwise use
-                    # the lighter-weight title extractor.
-                    if resolve_externals:
-                        items = list_headline_urls(d)
-                    else:
-                        items = extract_titles_from_date_url(d)
-
-                    if max_titles_per_date:
-                        items = items[:max_titles_per_date]
-
-                    for item in items:
-                        if resolve_externals and isinstance(item, (list, tuple)) and len(item) >= 2:
-                            title, article_url = item[0], item[1]
-                            record = {
-                                "year_url": y,
-                                "month_url": m,
-                                "date_url": d,
-                                "title": title,
-                                "article_url": article_url,
-                            }
-                            try:
-                                record["external_url"] = extract_external_link(article_url)
-                            except Exception:
-                                record["external_url"] = None
+    seen = None
+    if dedup or dedup_db:
+        from scraper.dedup import SeenTitles, dedup_key
+
+        seen = SeenTitles(dedup_db)
+
+    try:
+        # a persistent seen set skips records written by earlier runs, so keep them
+        with open(output_path, "a" if seen is not None and dedup_db else "w", encoding="utf-8") as out_f:
+            from tqdm import tqdm
+
+            pbar = tqdm(total=len(years), desc="years")
+            for y in years:
+                # From a year page, list month-like links
+                month_links = list_linked_pages(y, "year")
+                # Heuristic: months often include the year in path or be under the year page
+                if max_months:
+                    month_links = month_links[:max_months]
+
+                for m in month_links:
+                    # From month page, there will be date links
+                    date_links = list_linked_pages(m, "month")
+                    if max_dates:
+                        date_links = date_links[:max_dates]
+
+                    for d in date_links:
+                        # If resolving externals, prefer to fetch headline entries (title,url)
+                        # so we have the article URL to pass into the resolver. Otherwise use
+                        # the lighter-weight title extractor.
+                        if resolve_externals:
+                            items = list_headline_urls(d)
                         else:
-                            # item is a plain title string
-                            title = item if isinstance(item, str) else str(item)
-                            record = {
-                                "year_url": y,
-                                "month_url": m,
-                                "date_url": d,
-                                "title": title,
-                            }
-                        out_f.write(json.dumps(record, ensure_ascii=False) + "\n")
-                    time.sleep(delay)
-
-            pbar.update(1)
-            time.sleep(delay)
-        pbar.close()
+                            items = extract_titles_from_date_url(d)
+
+                        if max_titles_per_date:
+                            items = items[:max_titles_per_date]
+
+                        scope = dedup_scope(m, d)
+                        for item in items:
+                            if resolve_externals and isinstance(item, (list, tuple)) and len(item) >= 2:
+                                title, article_url = item[0], item[1]
+                            else:
+                                # item is a plain title string
+                                title = item if isinstance(item, str) else str(item)
+                                article_url = None
+
+                            # check before resolving so duplicates cost no extra requests
+                            if seen is not None:
+                                if article_url is not None:
+                                    key = dedup_key(article_dedup_key(article_url), "article")
+                                else:
+                                    key = dedup_key(title, scope)
+                                if not seen.add(key):
+                                    metrics.inc("duplicates", "date")
+                                    continue
+
+                            record = TitleRecord(y, m, d, title, article_url)
+                            if article_url is not None:
+                                try:
+                                    record.external_url = extract_external_link(article_url)
+                                except Exception:
+                                    record.external_url = None
+                            out_f.write(record.to_json() + "\n")
+                            metrics.record_emitted("date")
+                            events.emit(events.RECORD, page_type="date", date_url=d, title=title)
+                        if seen is not None:
+                            # persist this page's keys only once its records are on disk
+                            out_f.flush()
+                            seen.commit()
+                        time.sleep(delay)
+
+                pbar.update(1)
+                time.sleep(delay)
+            pbar.close()
+    finally:
+        if seen is not None:
+            seen.close()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Hierarchical NDLI TOI title scraper")
-    parser.add_argument("--start-url", required=True)
+    parser.add_argument("--start-url")
     parser.add_argument("--list-years", action="store_true", help="List candidate year URLs from the start page and exit")
     parser.add_argument("--list-months", action="store_true", help="List candidate month URLs from a year page and exit")
     parser.add_argument("--list-dates", action="store_true", help="List candidate date URLs from a month page and exit")
@@ -554,45 +712,92 @@ def main():
     parser.add_argument("--max-months", type=int)
     parser.add_argument("--max-dates", type=int)
     parser.add_argument("--max-titles-per-date", type=int)
+    parser.add_argument("--dedup", action="store_true", help="Skip headlines already written: by NDLI article id with --resolve-externals, else by normalized title within the same date (from the date page URL) or month page")
+    parser.add_argument("--dedup-db", help="SQLite file for the --dedup seen set; reuse it to dedup across runs, appending to --output (default: temporary)")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on /metrics (and JSON on /stats) at this port during the crawl")
+    parser.add_argument("--stats-file", help="Periodically write crawl metrics as JSON to this path")
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="Seconds between --stats-file rewrites")
+    parser.add_argument("--profile", action="store_true", help="Trace every fetch/parse/resolver event and print a hot-spot report at exit")
+    parser.add_argument("--profile-trace", default="profile_trace.jsonl", help="Where --profile writes the per-URL event trace")
+    parser.add_argument("--batch", action="store_true", help="With a --list-* mode, read start URLs from stdin (one per line) and prefix each output line with its start URL")
     args = parser.parse_args()
+    if args.batch and not (args.list_years or args.list_months or args.list_dates or args.list_headlines):
+        parser.error("--batch requires one of --list-years/--list-months/--list-dates/--list-headlines")
+    if args.batch and args.start_url:
+        parser.error("--batch reads start URLs from stdin; do not also pass --start-url")
+    if not args.batch and not args.start_url:
+        parser.error("--start-url is required unless --batch is given")
+
+    if args.profile:
+        with Profiler(args.profile_trace) as profiler:
+            try:
+                run_cli(args)
+            finally:
+                print(profiler.report(), file=sys.stderr)
+    else:
+        run_cli(args)
+
 
+def iter_listing(args: argparse.Namespace, url: str):
+    """Yield the output lines of the listing mode selected in ``args`` for ``url``."""
     if args.list_years:
-        years = list_year_urls(args.start_url)
-        for y in years:
-            print(y)
-        return
-    if args.list_months:
-        months = list_month_urls(args.start_url)
-        for m in months:
-            print(m)
-        return
-    if args.list_dates:
-        dates = list_date_urls(args.start_url)
-        # print tab-separated: label \t url
-        for label, url in dates:
-            print(f"{label}\t{url}")
+        yield from list_year_urls(url)
+    elif args.list_months:
+        yield from list_month_urls(url)
+    elif args.list_dates:
+        # tab-separated: label \t url
+        for label, date_url in list_date_urls(url):
+            yield f"{label}\t{date_url}"
+    elif args.list_headlines:
+        for title, article_url in list_headline_urls(url):
+            if args.resolve_externals:
+                ext = extract_external_link(article_url)
+                yield f"{title}\t{article_url}\t{ext if ext else ''}"
+            else:
+                yield f"{title}\t{article_url}"
+
+
+def run_cli(args: argparse.Namespace) -> None:
+    """Run the listing mode or hierarchical crawl selected by the parsed CLI ``args``."""
+    listing = args.list_years or args.list_months or args.list_dates or args.list_headlines
+    if args.batch:
+        # one start URL per stdin line; each output line is prefixed with its start URL
+        for line in sys.stdin:
+            url = line.strip()
+            if not url or url.startswith("#"):
+                continue
+            try:
+                for out in iter_listing(args, url):
+                    print(f"{url}\t{out}")
+            except RuntimeError as e:
+                print(e, file=sys.stderr)
         return
-    if args.list_headlines:
-        hits = list_headline_urls(args.start_url)
-        if args.resolve_externals:
-            for title, url in hits:
-                ext = extract_external_link(url)
-                print(f"{title}\t{url}\t{ext if ext else ''}")
-        else:
-            for title, url in hits:
-                print(f"{title}\t{url}")
+    if listing:
+        for out in iter_listing(args, args.start_url):
+            print(out)
         return
 
-    run_hierarchical_scrape(
-        args.start_url,
-        output_path=args.output,
-        delay=args.delay,
-        max_years=args.max_years,
-        max_months=args.max_months,
-        max_dates=args.max_dates,
-        max_titles_per_date=args.max_titles_per_date,
-        resolve_externals=args.resolve_externals,
-    )
+    server = start_http_server(args.metrics_port) if args.metrics_port else None
+    stats_writer = StatsFileWriter(args.stats_file, args.stats_interval).start() if args.stats_file else None
+    try:
+        run_hierarchical_scrape(
+            args.start_url,
+            output_path=args.output,
+            delay=args.delay,
+            max_years=args.max_years,
+            max_months=args.max_months,
+            max_dates=args.max_dates,
+            max_titles_per_date=args.max_titles_per_date,
+            resolve_externals=args.resolve_externals,
+            dedup=args.dedup or bool(args.dedup_db),
+            dedup_db=args.dedup_db,
+        )
+    finally:
+        if stats_writer:
+            stats_writer.stop()
+        if server:
+            server.shutdown()
+        print(metrics.summary(), file=sys.stderr)
 
 
 if __name__ == "__main__":
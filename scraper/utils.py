@@ -1,4 +1,3 @@
-from bs4 import BeautifulSoup
 from typing import Optional, Dict
 
 
@@ -8,6 +7,8 @@ def extract_text_and_title(html: str) -> Dict[str, Optional[str]]:
     Returns:
       {"title": str or None, "text": str or None, "html": original html}
     """
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "lxml")
 
     # Title
@@ -45,6 +46,8 @@ def extract_titles_from_page(html: str) -> Dict[str, list]:
     Returns a dict with a list of titles under key 'titles'. Titles are
     best-effort text contents of anchors or list items filtered by length.
     """
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "lxml")
 
     candidates = []
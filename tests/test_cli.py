@@ -0,0 +1,81 @@
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scraper import scrape_toi
+
+HEAVY_MODULES = ("requests", "bs4", "lxml", "tqdm", "http.server")
+
+# Ceiling for the cumulative `import scraper.scrape_toi` time. With the heavy
+# imports lazy it measures ~15-20 ms; an eager `import tqdm` (~45 ms) or
+# `import bs4` (~60-95 ms) alone pushes it over.
+IMPORT_BUDGET_US = 40_000
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_does_not_load_heavy_dependencies():
+    res = _run_python(
+        "import sys, scraper.scrape_toi; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert res.stdout.strip() == ""
+
+
+def test_import_time_within_budget():
+    res = _run_python("import scraper.scrape_toi", "-X", "importtime")
+    cumulative = None
+    for line in res.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = [p.strip() for p in line.split(":", 1)[-1].split("|")]
+        if len(parts) == 3 and parts[2] == "scraper.scrape_toi":
+            cumulative = int(parts[1])
+    assert cumulative is not None
+    assert cumulative < IMPORT_BUDGET_US
+
+
+def test_batch_mode_prefixes_each_start_url(monkeypatch, capsys):
+    def fake_list_year_urls(url):
+        if url.endswith("bad"):
+            raise RuntimeError(f"Failed to fetch start url {url}")
+        return [f"{url}/IN__thetoi_2017", f"{url}/IN__thetoi_2018"]
+
+    monkeypatch.setattr(scrape_toi, "list_year_urls", fake_list_year_urls)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("http://a\n\n# comment\nhttp://bad\nhttp://b\n"))
+    monkeypatch.setattr(sys, "argv", ["scrape_toi", "--list-years", "--batch"])
+
+    scrape_toi.main()
+
+    out, err = capsys.readouterr()
+    assert out.splitlines() == [
+        "http://a\thttp://a/IN__thetoi_2017",
+        "http://a\thttp://a/IN__thetoi_2018",
+        "http://b\thttp://b/IN__thetoi_2017",
+        "http://b\thttp://b/IN__thetoi_2018",
+    ]
+    assert "http://bad" in err
+
+
+def test_batch_requires_a_listing_mode(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["scrape_toi", "--batch"])
+    with pytest.raises(SystemExit):
+        scrape_toi.main()
+
+
+def test_batch_rejects_start_url(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["scrape_toi", "--list-years", "--batch", "--start-url", "http://a"])
+    with pytest.raises(SystemExit):
+        scrape_toi.main()
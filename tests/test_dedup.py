@@ -0,0 +1,169 @@
+import json
+import os
+import sys
+
+from scraper import scrape_toi
+from scraper.dedup import SeenTitles, dedup_key, normalize_title
+from scraper.metrics import CrawlMetrics
+from scraper.records import TitleRecord
+
+BASE = "http://www.ndl.gov.in/nw_document/toi/timesofindia"
+
+
+def test_normalize_title_folds_case_punctuation_and_whitespace():
+    assert normalize_title("  BIG  Headline, here! ") == "big headline here"
+    assert normalize_title("Ｆｕｌｌ width") == normalize_title("full WIDTH")
+
+
+def test_dedup_key_depends_on_title_and_date():
+    assert dedup_key("Big headline", "2017-01-01") == dedup_key("big headline!", "2017-01-01")
+    assert dedup_key("Big headline", "2017-01-01") != dedup_key("Big headline", "2017-01-02")
+    assert len(dedup_key("x" * 500, "2017-01-01")) == 16
+
+
+def test_seen_titles_temporary_db_is_removed(tmp_path):
+    seen = SeenTitles()
+    path = seen.path
+    assert seen.add(b"a") is True
+    assert seen.add(b"a") is False
+    assert b"a" in seen and b"b" not in seen
+    seen.close()
+    assert not os.path.exists(path)
+
+
+def test_seen_titles_persists_across_runs(tmp_path):
+    db = str(tmp_path / "seen.sqlite")
+    with SeenTitles(db) as seen:
+        assert seen.add(dedup_key("Title One", "2017-01-01"))
+    with SeenTitles(db) as seen:
+        assert not seen.add(dedup_key("title one", "2017-01-01"))
+        assert len(seen) == 1
+
+
+def test_title_record_matches_plain_and_resolved_output():
+    plain = TitleRecord("y", "m", "d", "Title")
+    assert not hasattr(plain, "__dict__")
+    assert json.loads(plain.to_json()) == {"year_url": "y", "month_url": "m", "date_url": "d", "title": "Title"}
+
+    resolved = TitleRecord("y", "m", "d", "Title", article_url="a")
+    assert list(resolved.to_dict()) == ["year_url", "month_url", "date_url", "title", "article_url", "external_url"]
+    assert resolved.to_dict()["external_url"] is None
+
+
+def test_date_key_only_accepts_explicit_date_segments():
+    assert scrape_toi.date_key(f"{BASE}/IN__thetoi_2017_01_05") == "2017-01-05"
+    assert scrape_toi.date_key(f"{BASE}/2017/1/5?page=2") == "2017-01-05"
+    assert scrape_toi.date_key(f"{BASE}/IN__thetoi_2024__6560_6561") is None
+    assert scrape_toi.date_key(f"{BASE}/56201234") is None
+    assert scrape_toi.date_key(f"{BASE}/99201234") is None
+    assert scrape_toi.date_key(f"{BASE}/2017-13-40") is None
+
+
+YEAR = f"{BASE}/IN__thetoi_2024__6560_6561"
+
+
+def _stub_crawl(monkeypatch, months):
+    """Stub the page fetchers: one year page linking to ``months`` ({month_url: {date_url: items}}).
+
+    Items are titles, or (title, article_url) pairs when externals are resolved.
+    """
+    resolved = []
+    m = CrawlMetrics()
+    date_pages = {d: items for dates in months.values() for d, items in dates.items()}
+    links = {YEAR: list(months), **{month: list(dates) for month, dates in months.items()}}
+    monkeypatch.setattr(scrape_toi, "metrics", m)
+    monkeypatch.setattr(scrape_toi, "list_year_urls", lambda url: [YEAR])
+    monkeypatch.setattr(scrape_toi, "list_linked_pages", lambda url, page_type="page": links[url])
+    monkeypatch.setattr(scrape_toi, "list_headline_urls", lambda url: date_pages[url])
+    monkeypatch.setattr(scrape_toi, "extract_titles_from_date_url", lambda url: date_pages[url])
+
+    def fake_resolve(article_url):
+        resolved.append(article_url)
+        return f"https://timesofindia.indiatimes.com/articleshow/{article_url.rsplit('/', 1)[-1]}.cms"
+
+    monkeypatch.setattr(scrape_toi, "extract_external_link", fake_resolve)
+    return m, resolved
+
+
+def _crawl(output, **kwargs):
+    scrape_toi.run_hierarchical_scrape(f"{BASE}/thetoi", output_path=str(output), delay=0, **kwargs)
+    return [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+
+def test_dedup_scope_prefers_url_date_then_month():
+    assert scrape_toi.dedup_scope(f"{BASE}/m", f"{BASE}/IN__thetoi_2017_01_05") == "2017-01-05"
+    assert scrape_toi.dedup_scope(f"{BASE}/m", f"{BASE}/IN__thetoi_2024__6560_6563") == f"month:{BASE}/m"
+    assert scrape_toi.article_dedup_key(f"{BASE}/56881247") == "56881247"
+
+
+def test_crawl_dedup_drops_repeat_across_real_date_pages(monkeypatch, tmp_path):
+    month = f"{BASE}/IN__thetoi_2024__6560_6562"
+    m, _ = _stub_crawl(monkeypatch, {month: {
+        f"{BASE}/IN__thetoi_2024__6560_6563": ["Big headline", "Other story"],
+        f"{BASE}/IN__thetoi_2024__6560_6564": ["BIG  headline!", "Third story"],
+    }})
+
+    records = _crawl(tmp_path / "out.jsonl", dedup=True)
+
+    assert [r["title"] for r in records] == ["Big headline", "Other story", "Third story"]
+    assert m.snapshot()["counters"]["duplicates"] == {"date": 1}
+
+
+def test_crawl_dedup_keeps_same_title_in_other_month(monkeypatch, tmp_path):
+    _stub_crawl(monkeypatch, {
+        f"{BASE}/IN__thetoi_2024__6560_6562": {f"{BASE}/IN__thetoi_2024__6560_6563": ["Weather update"]},
+        f"{BASE}/IN__thetoi_2024__6570_6572": {f"{BASE}/IN__thetoi_2024__6570_6573": ["Weather update"]},
+    })
+
+    assert len(_crawl(tmp_path / "out.jsonl", dedup=True)) == 2
+
+
+def test_crawl_dedup_by_article_id_skips_before_resolving(monkeypatch, tmp_path):
+    month = f"{BASE}/IN__thetoi_2024__6560_6562"
+    m, resolved = _stub_crawl(monkeypatch, {month: {
+        f"{BASE}/IN__thetoi_2024__6560_6563": [("Big headline", f"{BASE}/56881247"), ("Same title", f"{BASE}/56881248")],
+        f"{BASE}/IN__thetoi_2024__6560_6564": [("Big headline (updated)", f"{BASE}/56881247"), ("Same title", f"{BASE}/56881249")],
+    }})
+
+    records = _crawl(tmp_path / "out.jsonl", dedup=True, resolve_externals=True)
+
+    assert [r["article_url"] for r in records] == [f"{BASE}/56881247", f"{BASE}/56881248", f"{BASE}/56881249"]
+    assert resolved == [f"{BASE}/56881247", f"{BASE}/56881248", f"{BASE}/56881249"]
+    assert m.snapshot()["counters"]["duplicates"] == {"date": 1}
+
+
+def test_crawl_dedup_db_appends_and_commits_per_page(monkeypatch, tmp_path):
+    month = f"{BASE}/IN__thetoi_2024__6560_6562"
+    _, resolved = _stub_crawl(monkeypatch, {month: {
+        f"{BASE}/IN__thetoi_2024__6560_6563": [("Big headline", f"{BASE}/56881247")],
+    }})
+    out = tmp_path / "out.jsonl"
+    db = str(tmp_path / "seen.sqlite")
+
+    assert len(_crawl(out, dedup_db=db, resolve_externals=True)) == 1
+    assert len(_crawl(out, dedup_db=db, resolve_externals=True)) == 1
+    assert resolved == [f"{BASE}/56881247"]
+
+
+def test_seen_titles_persistent_db_is_durable_after_commit(tmp_path):
+    db = str(tmp_path / "seen.sqlite")
+    seen = SeenTitles(db)
+    assert seen._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    seen.add(b"a")
+    seen.commit()
+    # another connection sees committed keys while the writer is still open
+    with SeenTitles(db) as other:
+        assert b"a" in other
+    seen.close()
+
+
+def test_dedup_db_flag_implies_dedup(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(scrape_toi, "run_hierarchical_scrape", lambda *a, **kw: calls.append(kw))
+    db = str(tmp_path / "seen.sqlite")
+    monkeypatch.setattr(sys, "argv", ["scrape_toi", "--start-url", f"{BASE}/thetoi", "--dedup-db", db])
+
+    scrape_toi.main()
+
+    assert calls[0]["dedup"] is True
+    assert calls[0]["dedup_db"] == db
@@ -0,0 +1,61 @@
+import json
+
+from scraper import events, scrape_toi
+from scraper.profiling import Profiler
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+def test_emit_delivers_to_registered_hooks_only():
+    seen = []
+    events.register(seen.append)
+    try:
+        events.emit(events.RECORD, title="A headline")
+    finally:
+        events.unregister(seen.append)
+    events.emit(events.RECORD, title="Not delivered")
+
+    assert len(seen) == 1
+    assert seen[0]["event"] == "record"
+    assert seen[0]["title"] == "A headline"
+    assert "ts" in seen[0]
+
+
+def test_failing_hook_does_not_interrupt_emit():
+    seen = []
+
+    def broken(event):
+        raise ValueError("boom")
+
+    events.register(broken)
+    events.register(seen.append)
+    try:
+        events.emit(events.PARSE, url="u", page_type="date", seconds=0.1)
+    finally:
+        events.unregister(broken)
+        events.unregister(seen.append)
+    assert len(seen) == 1
+
+
+def test_extract_external_link_emits_resolver_branch(monkeypatch, tmp_path):
+    pages = {
+        "http://www.ndl.gov.in/nw_document/toi/timesofindia/123": (
+            '<html><head><link rel="canonical" '
+            'href="https://timesofindia.indiatimes.com/x/articleshow/123.cms"></head></html>'
+        ),
+    }
+    monkeypatch.setattr(scrape_toi, "fetch", lambda url, page_type, **kw: FakeResponse(pages[url]))
+
+    trace = tmp_path / "trace.jsonl"
+    with Profiler(str(trace)) as profiler:
+        url = scrape_toi.extract_external_link("http://www.ndl.gov.in/nw_document/toi/timesofindia/123")
+
+    assert url == "https://timesofindia.indiatimes.com/x/articleshow/123.cms"
+    assert profiler.branches["canonical"]["count"] == 1
+    assert profiler.branches["canonical"]["requests"] == 1
+    resolved = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert [e["branch"] for e in resolved if e["event"] == "resolve"] == ["canonical"]
+    assert "canonical" in profiler.report()
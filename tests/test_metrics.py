@@ -0,0 +1,122 @@
+import json
+import time
+from urllib.request import urlopen
+
+from scraper import scrape_toi
+from scraper.metrics import CrawlMetrics, StatsFileWriter, start_http_server
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.pages[url])
+
+
+def test_crawl_metrics_snapshot_and_summary():
+    m = CrawlMetrics()
+    m.observe_fetch("year", 0.2, nbytes=1000)
+    m.observe_fetch("year", 0.4, error=True)
+    m.observe_parse("year", 0.01)
+    m.record_emitted("date", 3)
+
+    snap = m.snapshot()
+    assert snap["counters"]["fetches"]["year"] == 2
+    assert snap["counters"]["fetch_errors"]["year"] == 1
+    assert snap["counters"]["bytes"]["year"] == 1000
+    assert snap["counters"]["records"]["date"] == 3
+    assert snap["histograms"]["fetch_seconds"]["year"]["count"] == 2
+    assert snap["records_per_second_by_page_type"]["date"] > 0
+    json.dumps(snap)
+
+    summary = m.summary()
+    assert "3 records" in summary
+    assert "year" in summary
+
+
+def test_render_prometheus_histogram_is_cumulative():
+    m = CrawlMetrics()
+    m.observe_fetch("date", 0.03)
+    m.observe_fetch("date", 3.0)
+
+    text = m.render_prometheus()
+    assert 'ndli_toi_fetches_total{page_type="date"} 2' in text
+    assert 'ndli_toi_fetch_seconds_bucket{page_type="date",le="0.05"} 1' in text
+    assert 'ndli_toi_fetch_seconds_bucket{page_type="date",le="5.0"} 2' in text
+    assert 'ndli_toi_fetch_seconds_bucket{page_type="date",le="+Inf"} 2' in text
+
+
+def test_http_server_serves_metrics_and_stats():
+    m = CrawlMetrics()
+    m.observe_fetch("month", 0.1, nbytes=10)
+    server = start_http_server(0, host="127.0.0.1", registry=m)
+    try:
+        port = server.server_address[1]
+        body = urlopen(f"http://127.0.0.1:{port}/metrics").read().decode("utf-8")
+        assert 'ndli_toi_bytes_total{page_type="month"} 10' in body
+        stats = json.loads(urlopen(f"http://127.0.0.1:{port}/stats").read())
+        assert stats["counters"]["fetches"]["month"] == 1
+    finally:
+        server.shutdown()
+
+
+def test_fetch_and_parse_feed_the_registry(monkeypatch):
+    start_url = "http://www.ndl.gov.in/nw_document/toi/timesofindia/thetoi"
+    html = '<a href="/nw_document/toi/timesofindia/IN__thetoi_2024__6560_6561">2024</a>'
+    m = CrawlMetrics()
+    monkeypatch.setattr(scrape_toi, "metrics", m)
+    monkeypatch.setattr(scrape_toi, "_session", FakeSession({start_url: html}))
+
+    years = scrape_toi.list_year_urls(start_url)
+
+    assert years == ["http://www.ndl.gov.in/nw_document/toi/timesofindia/IN__thetoi_2024__6560_6561"]
+    snap = m.snapshot()
+    assert snap["counters"]["fetches"] == {"start": 1}
+    assert snap["counters"]["bytes"] == {"start": len(html.encode("utf-8"))}
+    assert snap["histograms"]["fetch_seconds"]["start"]["count"] == 1
+    assert snap["histograms"]["parse_seconds"]["start"]["count"] == 1
+
+
+def test_stats_file_writer_rewrites_and_writes_final_snapshot(tmp_path):
+    m = CrawlMetrics()
+    path = tmp_path / "stats.json"
+    writer = StatsFileWriter(str(path), interval=0.01, registry=m).start()
+    try:
+        deadline = time.time() + 5
+        while not path.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        assert json.loads(path.read_text())["counters"]["records"] == {}
+        m.record_emitted("date", 2)
+    finally:
+        writer.stop()
+
+    assert json.loads(path.read_text())["counters"]["records"] == {"date": 2}
+    assert not (tmp_path / "stats.json.tmp").exists()
+
+
+def test_run_hierarchical_scrape_resets_the_registry(monkeypatch, tmp_path):
+    base = "http://www.ndl.gov.in/nw_document/toi/timesofindia"
+    m = CrawlMetrics()
+    m.started -= 3600
+    monkeypatch.setattr(scrape_toi, "metrics", m)
+    monkeypatch.setattr(scrape_toi, "list_year_urls", lambda url: [f"{base}/year"])
+    monkeypatch.setattr(scrape_toi, "list_linked_pages", lambda url, page_type="page": [f"{base}/next"])
+    monkeypatch.setattr(scrape_toi, "extract_titles_from_date_url", lambda url: ["A headline"])
+
+    for _ in range(2):
+        scrape_toi.run_hierarchical_scrape(f"{base}/thetoi", output_path=str(tmp_path / "out.jsonl"), delay=0)
+
+    snap = m.snapshot()
+    assert snap["counters"]["records"] == {"date": 1}
+    assert snap["elapsed_seconds"] < 60